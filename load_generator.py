@@ -0,0 +1,424 @@
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+import tracemalloc
+
+from Blind_Bidding import generate_deck, resolve_bid_round, resource_management_update
+
+
+CARD_DEFINITIONS = {
+    "Resource Gain": {"quantity": 5, "effect": "gain", "amount": 10},
+    "Resource Loss": {"quantity": 3, "effect": "lose", "amount": 8},
+    "Steal Resource": {"quantity": 2, "effect": "steal", "amount": 5},
+    "No Effect": {"quantity": 4, "effect": "none", "amount": 0}
+}
+
+
+def card_resource_change(card):
+    """
+    Converts a card from generate_deck into the change it makes to the winner's resources.
+
+    Steal cards also change another player, so apply_card_effect handles them and
+    they are not covered here.
+
+    Args:
+        card (dict): A card with 'effect' and 'amount' keys.
+
+    Returns:
+        int: How much the winner's resources go up (or down if negative).
+    """
+    if card["effect"] == "gain":
+        return card["amount"]
+    if card["effect"] == "lose":
+        return -card["amount"]
+    return 0
+
+
+def change_player_resources(player_resources, player, amount):
+    """
+    Adds amount (can be negative) to one player's resources using resource_management_update.
+
+    Returns:
+        dict: New dictionary of player names and their resources.
+    """
+    status_update = resource_management_update(
+        player_resources, {"Winner": player, "bid_cost": 0}, {"change_resource": amount})
+    return {name: status["resources"] for name, status in status_update.items()}
+
+
+def apply_card_effect(player_resources, card, winning_players):
+    """
+    Applies the revealed card to every winner of the round, one at a time since ties are possible.
+
+    A steal card takes up to its amount from the richest player who did not win
+    and gives it to the winner. Nothing is stolen if every player won or the
+    richest other player has nothing left.
+
+    Args:
+        player_resources (dict): Resources after the winning bid was paid.
+        card (dict): The revealed card.
+        winning_players (list): Players who won the bid.
+
+    Returns:
+        dict: Player resources after the card effect.
+    """
+    resources = dict(player_resources)
+    for winner in winning_players:
+        if card["effect"] == "steal":
+            others = [player for player in resources if player not in winning_players]
+            if not others:
+                continue
+            victim = max(others, key=resources.get)
+            stolen = min(card["amount"], max(0, resources[victim]))
+            resources = change_player_resources(resources, victim, -stolen)
+            resources = change_player_resources(resources, winner, stolen)
+        else:
+            resources = change_player_resources(resources, winner, card_resource_change(card))
+    return resources
+
+
+def scripted_bid(resources, rng):
+    """
+    A bot that always bids a quarter of what it has.
+    """
+    return max(0, resources // 4)
+
+
+def random_bid(resources, rng):
+    """
+    A bot that bids a random amount it can afford.
+    """
+    return rng.randint(0, max(0, resources))
+
+
+BOT_STRATEGIES = {"scripted": scripted_bid, "random": random_bid}
+
+
+def create_table(table_id, num_players, starting_resources, rng):
+    """
+    Sets up the server side state for one game table.
+
+    Args:
+        table_id (int): The number of the table.
+        num_players (int): How many bot clients sit at the table.
+        starting_resources (int): Resources every player starts with.
+        rng (random.Random): Random generator used to shuffle the deck.
+
+    Returns:
+        dict: The table state, including the bid intake queue and one inbox per player.
+    """
+    players = [f"T{table_id}-Bot{n}" for n in range(num_players)]
+    deck = generate_deck(CARD_DEFINITIONS)
+    rng.shuffle(deck)
+    return {
+        "table_id": table_id,
+        "players": players,
+        "player_resources": {player: starting_resources for player in players},
+        "deck": deck,
+        "bid_queue": asyncio.Queue(),
+        "inboxes": {player: asyncio.Queue() for player in players},
+        "latencies": []
+    }
+
+
+def draw_card(table, rng):
+    """
+    Takes the next card from the table's deck, building a new shuffled deck when it runs out.
+    """
+    if not table["deck"]:
+        table["deck"] = generate_deck(CARD_DEFINITIONS)
+        rng.shuffle(table["deck"])
+    return table["deck"].pop()
+
+
+def broadcast(table, message):
+    """
+    Sends the same message to every bot at the table.
+    """
+    for inbox in table["inboxes"].values():
+        inbox.put_nowait(message)
+
+
+async def bot_client(table, player, strategy, rng, think_time):
+    """
+    A synthetic player. It waits for a round to open, sends a bid and keeps track
+    of its resources from the state broadcasts until the game is over.
+
+    Args:
+        table (dict): The table the bot is sitting at.
+        player (str): The bot's player name.
+        strategy (function): Picks a bid from the bot's resources and a random generator.
+        rng (random.Random): Random generator used by the strategy and think time.
+        think_time (float): Longest time in seconds the bot waits before bidding.
+    """
+    inbox = table["inboxes"][player]
+    resources = table["player_resources"][player]
+    while True:
+        message = await inbox.get()
+        if message["type"] == "round_open":
+            if think_time > 0:
+                await asyncio.sleep(rng.uniform(0, think_time))
+            await table["bid_queue"].put((player, strategy(resources, rng)))
+        elif message["type"] == "state":
+            resources = message["player_resources"][player]
+        elif message["type"] == "game_over":
+            return
+
+
+async def run_table(table, rounds, rate, rng):
+    """
+    Runs the server side of one table with open loop round arrivals.
+
+    Rounds are scheduled ahead of time from a Poisson process at the given rate, so a
+    slow round makes the next ones wait instead of slowing the arrivals down. Latency
+    is measured from the scheduled arrival until the state broadcast, which includes
+    that waiting time.
+
+    Args:
+        table (dict): The table created by create_table.
+        rounds (int): Number of rounds to play.
+        rate (float): Round arrivals per second for this table.
+        rng (random.Random): Random generator for arrivals and the deck.
+    """
+    loop = asyncio.get_running_loop()
+    arrival = loop.time()
+    num_players = len(table["players"])
+
+    for round_number in range(1, rounds + 1):
+        arrival += rng.expovariate(rate)
+        delay = arrival - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        broadcast(table, {"type": "round_open", "round": round_number})
+
+        # Bid intake
+        bids = {}
+        while len(bids) < num_players:
+            player, bid = await table["bid_queue"].get()
+            bids[player] = bid
+
+        current_card = draw_card(table, rng)
+        outcome = resolve_bid_round(current_card["type"], table["player_resources"], bids)
+
+        resources = apply_card_effect(outcome["updated_resources"], current_card,
+                                      outcome["winning_players"])
+        table["player_resources"] = resources
+
+        broadcast(table, {"type": "state", "round": round_number,
+                          "player_resources": dict(resources)})
+        table["latencies"].append(loop.time() - arrival)
+
+    broadcast(table, {"type": "game_over"})
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(len(sorted_values) * pct / 100))
+    return sorted_values[rank - 1]
+
+
+async def play_tables(tables, players, rounds, rate, strategy, think_time,
+                      starting_resources, seed):
+    """
+    Starts every table and bot client as asyncio tasks and waits for all the games to end.
+
+    Returns:
+        list: The finished tables, each with its round latencies.
+    """
+    rng = random.Random(seed)
+    game_tables = [create_table(n, players, starting_resources, rng) for n in range(tables)]
+    tasks = []
+    for table in game_tables:
+        for player in table["players"]:
+            name = strategy if strategy != "mixed" else rng.choice(list(BOT_STRATEGIES))
+            bot_rng = random.Random(rng.random())
+            tasks.append(bot_client(table, player, BOT_STRATEGIES[name], bot_rng, think_time))
+        tasks.append(run_table(table, rounds, rate, random.Random(rng.random())))
+
+    await asyncio.gather(*tasks)
+    return game_tables
+
+
+async def run_load(tables, players, rounds, rate, strategy, think_time,
+                   starting_resources, seed, measure_memory):
+    """
+    Plays a timed run and collects the results.
+
+    Memory is measured in a second, untimed run with tracemalloc turned on, so the
+    latency figures are never taken with tracing overhead. Both runs use the same
+    seed; when none is given one is picked and put in the report.
+
+    Returns:
+        dict: Report with the seed, throughput, latency percentiles (seconds) and
+              memory per table.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    start = time.perf_counter()
+    game_tables = await play_tables(tables, players, rounds, rate, strategy, think_time,
+                                    starting_resources, seed)
+    elapsed = time.perf_counter() - start
+
+    memory_per_table = None
+    if measure_memory:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await play_tables(tables, players, rounds, rate, strategy, think_time,
+                          starting_resources, seed)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        memory_per_table = (peak - baseline) / tables
+
+    latencies = sorted(latency for table in game_tables for latency in table["latencies"])
+    return {
+        "seed": seed,
+        "tables": tables,
+        "bots": tables * players,
+        "rounds": len(latencies),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "p999": percentile(latencies, 99.9),
+        "memory_per_table": memory_per_table
+    }
+
+
+def display_report(report):
+    """
+    Prints the results of a load run.
+    """
+    print("\n--- Load Test Report ---")
+    print(f"Tables: {report['tables']}  Bots: {report['bots']}  Seed: {report['seed']}")
+    print(f"Rounds played: {report['rounds']} in {report['elapsed']:.2f}s")
+    print(f"Throughput: {report['throughput']:.1f} rounds/s")
+    print(f"Round latency p50: {report['p50'] * 1000:.3f} ms")
+    print(f"Round latency p99: {report['p99'] * 1000:.3f} ms")
+    print(f"Round latency p999: {report['p999'] * 1000:.3f} ms")
+    if report["memory_per_table"] is not None:
+        print(f"Memory per table: {report['memory_per_table'] / 1024:.1f} KiB")
+    print("------------------------")
+
+
+def check_budgets(report, budgets):
+    """
+    Compares the latency percentiles against the budgets.
+
+    Args:
+        report (dict): The report from run_load.
+        budgets (dict): Budget in milliseconds for 'p50', 'p99' and/or 'p999'.
+                        Missing or None budgets are not checked.
+
+    Returns:
+        list: A message for every budget that was not met (empty if all passed).
+              A measurement that cannot be compared, like NaN, counts as not met.
+    """
+    failures = []
+    for name, budget_ms in budgets.items():
+        if budget_ms is None:
+            continue
+        measured_ms = report[name] * 1000
+        if not measured_ms <= budget_ms:
+            failures.append(f"{name} latency {measured_ms:.3f} ms is over the budget of {budget_ms} ms")
+    return failures
+
+
+def positive_int(value):
+    """
+    argparse type for whole numbers of at least 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def positive_float(value):
+    """
+    argparse type for finite numbers greater than 0.
+    """
+    number = float(value)
+    if not math.isfinite(number) or number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a finite number greater than 0, got {value}")
+    return number
+
+
+def non_negative_float(value):
+    """
+    argparse type for finite numbers of 0 or more.
+    """
+    number = float(value)
+    if not math.isfinite(number) or number < 0:
+        raise argparse.ArgumentTypeError(f"must be a finite number of 0 or more, got {value}")
+    return number
+
+
+def parse_args(argv=None):
+    """
+    Reads the command line options and checks that the budget options go with --regression.
+
+    Args:
+        argv (list, optional): Options to parse. Defaults to None, which reads sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs synthetic bot clients against a local game server stand-in.")
+    parser.add_argument("--tables", type=positive_int, default=500)
+    parser.add_argument("--players", type=positive_int, default=4, help="bot clients per table")
+    parser.add_argument("--rounds", type=positive_int, default=20, help="rounds per table")
+    parser.add_argument("--rate", type=positive_float, default=10.0, help="round arrivals per second per table")
+    parser.add_argument("--strategy", choices=["scripted", "random", "mixed"], default="mixed")
+    parser.add_argument("--think-time", type=non_negative_float, default=0.0,
+                        help="longest time in seconds a bot waits before bidding")
+    parser.add_argument("--starting-resources", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the separate tracemalloc run used to measure memory per table")
+    parser.add_argument("--regression", action="store_true",
+                        help="exit with an error if a latency budget is exceeded "
+                             "(needs at least one --budget-* option)")
+    parser.add_argument("--budget-p50", type=non_negative_float, default=None, help="milliseconds")
+    parser.add_argument("--budget-p99", type=non_negative_float, default=None, help="milliseconds")
+    parser.add_argument("--budget-p999", type=non_negative_float, default=None, help="milliseconds")
+    args = parser.parse_args(argv)
+
+    has_budget = any(budget is not None
+                     for budget in (args.budget_p50, args.budget_p99, args.budget_p999))
+    if args.regression and not has_budget:
+        parser.error("--regression needs at least one of --budget-p50, --budget-p99 or --budget-p999")
+    if has_budget and not args.regression:
+        parser.error("--budget-* options are only checked with --regression")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run_load(args.tables, args.players, args.rounds, args.rate,
+                                  args.strategy, args.think_time, args.starting_resources,
+                                  args.seed, not args.no_memory))
+    display_report(report)
+
+    if args.regression:
+        failures = check_budgets(report, {"p50": args.budget_p50, "p99": args.budget_p99,
+                                          "p999": args.budget_p999})
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if failures:
+            return 1
+        print("All latency budgets met.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
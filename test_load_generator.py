@@ -0,0 +1,150 @@
+import asyncio
+import math
+
+import pytest
+
+import load_generator
+from load_generator import (apply_card_effect, card_resource_change, check_budgets, main,
+                            parse_args, percentile, play_tables, run_load)
+
+
+def test_percentile_empty_list():
+    assert percentile([], 99) == 0.0
+
+
+def test_percentile_single_value():
+    assert percentile([7], 50) == 7
+    assert percentile([7], 99.9) == 7
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 1001))
+    assert percentile(values, 50) == 500
+    assert percentile(values, 99) == 990
+    assert percentile(values, 99.9) == 999
+    assert percentile(values, 100) == 1000
+
+
+def test_check_budgets_over_budget():
+    report = {"p50": 0.002, "p99": 0.010, "p999": 0.020}
+    failures = check_budgets(report, {"p99": 5})
+    assert len(failures) == 1
+    assert failures[0].startswith("p99")
+
+
+def test_check_budgets_under_budget():
+    report = {"p50": 0.002, "p99": 0.010, "p999": 0.020}
+    assert check_budgets(report, {"p50": 5, "p99": 15, "p999": 25}) == []
+
+
+def test_check_budgets_skips_none():
+    report = {"p50": 0.002, "p99": 0.010, "p999": 0.020}
+    assert check_budgets(report, {"p50": None, "p99": None, "p999": 25}) == []
+
+
+def test_check_budgets_nan_measurement_fails():
+    report = {"p50": float("nan"), "p99": 0.010, "p999": 0.020}
+    failures = check_budgets(report, {"p50": 5})
+    assert len(failures) == 1
+    assert failures[0].startswith("p50")
+
+
+def test_card_resource_change_sign():
+    assert card_resource_change({"effect": "gain", "amount": 10}) == 10
+    assert card_resource_change({"effect": "lose", "amount": 8}) == -8
+    assert card_resource_change({"effect": "none", "amount": 0}) == 0
+
+
+def test_apply_card_effect_steal_moves_resources():
+    resources = {"A": 10, "B": 30, "C": 3}
+    updated = apply_card_effect(resources, {"effect": "steal", "amount": 5}, ["A"])
+    assert updated == {"A": 15, "B": 25, "C": 3}
+    assert sum(updated.values()) == sum(resources.values())
+
+
+def test_apply_card_effect_steal_limited_by_victim():
+    updated = apply_card_effect({"A": 10, "B": 2}, {"effect": "steal", "amount": 5}, ["A"])
+    assert updated == {"A": 12, "B": 0}
+
+
+def test_apply_card_effect_steal_when_everyone_won():
+    updated = apply_card_effect({"A": 10, "B": 10}, {"effect": "steal", "amount": 5}, ["A", "B"])
+    assert updated == {"A": 10, "B": 10}
+
+
+def test_run_load_end_to_end():
+    report = asyncio.run(run_load(2, 3, 5, 1000.0, "mixed", 0.0, 50, 1, False))
+    assert report["rounds"] == 10
+    assert report["seed"] == 1
+    assert report["memory_per_table"] is None
+    assert all(math.isfinite(report[name]) for name in ("p50", "p99", "p999"))
+    assert 0 <= report["p50"] <= report["p99"] <= report["p999"]
+
+
+def test_run_load_picks_a_seed():
+    report = asyncio.run(run_load(1, 2, 2, 1000.0, "random", 0.0, 50, None, True))
+    assert isinstance(report["seed"], int)
+    assert report["memory_per_table"] > 0
+
+
+def test_play_tables_keeps_resources_consistent(monkeypatch):
+    paid = []
+    card_changes = []
+    real_resolve = load_generator.resolve_bid_round
+    real_apply = load_generator.apply_card_effect
+
+    def recording_resolve(current_card, player_resources, bids):
+        outcome = real_resolve(current_card, player_resources, bids)
+        paid.append(outcome["winning_bid"] * len(outcome["winning_players"]))
+        return outcome
+
+    def recording_apply(player_resources, card, winning_players):
+        updated = real_apply(player_resources, card, winning_players)
+        card_changes.append(sum(updated.values()) - sum(player_resources.values()))
+        return updated
+
+    monkeypatch.setattr(load_generator, "resolve_bid_round", recording_resolve)
+    monkeypatch.setattr(load_generator, "apply_card_effect", recording_apply)
+
+    tables = asyncio.run(play_tables(3, 4, 20, 1000.0, "mixed", 0.0, 50, 7))
+
+    assert len(paid) == len(card_changes) == 3 * 20
+    for table in tables:
+        assert len(table["latencies"]) == 20
+        assert set(table["player_resources"]) == set(table["players"])
+    total = sum(sum(table["player_resources"].values()) for table in tables)
+    assert total == 3 * 4 * 50 - sum(paid) + sum(card_changes)
+
+
+def test_main_regression_under_budget():
+    assert main(["--tables", "2", "--players", "2", "--rounds", "3", "--rate", "1000",
+                 "--seed", "1", "--no-memory", "--regression", "--budget-p99", "100000"]) == 0
+
+
+def test_main_regression_over_budget():
+    assert main(["--tables", "2", "--players", "2", "--rounds", "3", "--rate", "1000",
+                 "--seed", "1", "--no-memory", "--regression", "--budget-p50", "0"]) == 1
+
+
+@pytest.mark.parametrize("argv", [
+    ["--regression"],
+    ["--budget-p99", "5"],
+    ["--tables", "0"],
+    ["--players", "0"],
+    ["--rounds", "0"],
+    ["--rate", "0"],
+    ["--rate", "nan"],
+    ["--rate", "inf"],
+    ["--think-time", "-1"],
+    ["--regression", "--budget-p99", "nan"],
+    ["--regression", "--budget-p50", "-1"],
+])
+def test_parse_args_rejects_bad_options(argv):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+
+def test_parse_args_accepts_regression_with_budget():
+    args = parse_args(["--regression", "--budget-p99", "5"])
+    assert args.regression
+    assert args.budget_p99 == 5